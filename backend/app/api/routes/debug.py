@@ -0,0 +1,70 @@
+import os
+from functools import lru_cache
+
+from fastapi import APIRouter
+
+from app.llm.client import LLMClient
+
+router = APIRouter()
+
+
+@lru_cache(maxsize=1)
+def _client() -> LLMClient:
+    """One LLMClient shared by the debug endpoints."""
+    return LLMClient()
+
+
+@router.get("/llm")
+def debug_llm():
+    """Debug endpoint to check LLM configuration."""
+    client = _client()
+    return {
+        "provider": client.provider,
+        "api_key_present": bool(client.api_key and client.api_key.strip()),
+        "api_key_prefix": client.api_key[:10] + "..." if client.api_key and len(client.api_key) > 10 else "none",
+        "env_llm_provider": os.getenv("LLM_PROVIDER", "not set"),
+        "env_llm_api_key": "set" if os.getenv("LLM_API_KEY") else "not set",
+        "env_openai_api_key": "set" if os.getenv("OPENAI_API_KEY") else "not set",
+        "env_llm_model": os.getenv("LLM_MODEL", "not set"),
+    }
+
+
+@router.get("/test-openai")
+def test_openai():
+    """Test OpenAI connection with a simple request."""
+    client = _client()
+    if client.provider != "openai":
+        return {
+            "status": "skipped",
+            "reason": f"Provider is '{client.provider}', not 'openai'",
+            "provider": client.provider
+        }
+    
+    if not client.api_key or not client.api_key.strip():
+        return {
+            "status": "error",
+            "reason": "API key is missing or empty",
+            "api_key_present": False
+        }
+    
+    try:
+        # Test with a very simple prompt
+        result = client.generate(
+            prompt="Say 'Hello, OpenAI connection test successful!' in exactly those words.",
+            json_mode=False
+        )
+        return {
+            "status": "success",
+            "response_preview": result[:200] if result else "empty",
+            "response_length": len(result) if result else 0,
+            "api_key_present": True,
+            "provider": client.provider
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_type": type(e).__name__,
+            "error_message": str(e)[:500],
+            "api_key_present": True,
+            "provider": client.provider
+        }
@@ -10,6 +10,7 @@ from app.db.models import (
 )
 from app.generation.category_scoring import score_categories, select_top_4_categories
 from app.generation.initiative_expansion import expand_core_initiatives, generate_sandbox_initiatives
+from app.llm.prompts import build_prompt_context
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -50,6 +51,9 @@ def generate_cycle(cycle_id: str, db: Session = Depends(get_db)):
         if not qr.derived_signals:
             raise HTTPException(status_code=400, detail="Derived signals are missing")
         
+        # Render the intake-derived prompt blocks once; all three LLM steps share them
+        prompt_context = build_prompt_context(qr.responses, qr.derived_signals, cycle.vertical_id)
+        
         # Step 1: Score categories
         print("[GENERATE] Step 1/4: Scoring categories (calling OpenAI)...", file=sys.stderr, flush=True)
         logger.info("Step 1/4: Scoring categories for cycle %s", cycle_id)
@@ -57,7 +61,8 @@ def generate_cycle(cycle_id: str, db: Session = Depends(get_db)):
             category_scores = score_categories(
                 qr.responses,
                 qr.derived_signals,
-                cycle.vertical_id
+                cycle.vertical_id,
+                prompt_context=prompt_context,
             )
             print("[GENERATE] Step 1/4 complete: %d scores" % (len(category_scores) if category_scores else 0), file=sys.stderr, flush=True)
             logger.info("Step 1/4 complete: Got %d category scores", len(category_scores) if category_scores else 0)
@@ -94,7 +99,8 @@ def generate_cycle(cycle_id: str, db: Session = Depends(get_db)):
                 qr.responses,
                 qr.derived_signals,
                 top_4_ids,
-                cycle.vertical_id
+                cycle.vertical_id,
+                prompt_context=prompt_context,
             )
             print("[GENERATE] Step 3/4 complete: %d initiatives" % (len(core_initiatives) if core_initiatives else 0), file=sys.stderr, flush=True)
             logger.info("Step 3/4 complete: Got %d core initiatives", len(core_initiatives) if core_initiatives else 0)
@@ -128,6 +134,7 @@ def generate_cycle(cycle_id: str, db: Session = Depends(get_db)):
                 qr.derived_signals,
                 top_4_ids,
                 cycle.vertical_id,
+                prompt_context=prompt_context,
             )
             print("[GENERATE] Step 4/4 complete: %d sandbox" % (len(sandbox_initiatives) if sandbox_initiatives else 0), file=sys.stderr, flush=True)
             logger.info("Step 4/4 complete: Got %d sandbox initiatives", len(sandbox_initiatives) if sandbox_initiatives else 0)
@@ -116,6 +116,30 @@ def _get_competitor_ids(restaurants_df: pd.DataFrame) -> set:
     return set(restaurants_df[~restaurants_df['is_target']]['restaurant_id'].tolist())
 
 
+def _build_confidence_lookup(restaurants_df: pd.DataFrame) -> dict:
+    """
+    Map restaurant_id -> confidence score.
+
+    Reads the id/rating/review_count columns directly instead of building
+    a Series per row with iterrows(). Missing columns count as None.
+    """
+    if restaurants_df is None or restaurants_df.empty:
+        return {}
+
+    def _column(name: str) -> list:
+        if name in restaurants_df.columns:
+            return restaurants_df[name].tolist()
+        return [None] * len(restaurants_df)
+
+    return {
+        rid: _calculate_confidence_score(rating, review_count)
+        for rid, rating, review_count in zip(
+            _column('restaurant_id'), _column('rating'), _column('review_count')
+        )
+        if rid
+    }
+
+
 def analyze_narrow_groups(
     grouped_data: dict,
     restaurants_df: pd.DataFrame,
@@ -154,15 +178,7 @@ def analyze_narrow_groups(
     total_competitors = len(competitor_ids)
 
     # Build restaurant confidence lookup
-    restaurant_confidence = {}
-    if restaurants_df is not None and not restaurants_df.empty:
-        for _, row in restaurants_df.iterrows():
-            rid = row.get('restaurant_id')
-            if rid:
-                restaurant_confidence[rid] = _calculate_confidence_score(
-                    row.get('rating'),
-                    row.get('review_count')
-                )
+    restaurant_confidence = _build_confidence_lookup(restaurants_df)
 
     rows = []
     for group_name, items in grouped_data['narrow_groups'].items():
@@ -292,15 +308,7 @@ def analyze_wide_groups(
     total_competitors = len(competitor_ids)
 
     # Build restaurant confidence lookup
-    restaurant_confidence = {}
-    if restaurants_df is not None and not restaurants_df.empty:
-        for _, row in restaurants_df.iterrows():
-            rid = row.get('restaurant_id')
-            if rid:
-                restaurant_confidence[rid] = _calculate_confidence_score(
-                    row.get('rating'),
-                    row.get('review_count')
-                )
+    restaurant_confidence = _build_confidence_lookup(restaurants_df)
 
     rows = []
     for category, items in grouped_data['wide_groups'].items():
@@ -27,8 +27,6 @@ from dataclasses import dataclass, field
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 
 
 # =============================================================================
@@ -709,6 +707,10 @@ def generate_initiatives(
 # =============================================================================
 # VISUALIZATIONS
 # =============================================================================
+# matplotlib is imported inside each chart helper: it is heavy to load and only
+# the competitor pipeline draws charts, not every process importing this module.
+# Charts use Figure directly rather than pyplot, so no global figure registry
+# (or its lock) is involved and nothing needs closing afterwards.
 
 def create_price_positioning_chart(
     price_analysis: dict,
@@ -732,7 +734,10 @@ def create_price_positioning_chart(
     if data.empty:
         return None
 
-    fig, ax = plt.subplots(figsize=figsize)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
 
     # Plot items
     colors = []
@@ -775,6 +780,8 @@ def create_price_positioning_chart(
     ax.set_title('Price Positioning: Target vs Competitors', fontsize=13, fontweight='bold')
 
     # Legend
+    import matplotlib.patches as mpatches
+
     legend_elements = [
         mpatches.Patch(color='#e74c3c', label='Overpriced (>p75)'),
         mpatches.Patch(color='#3498db', label='Competitive'),
@@ -783,14 +790,12 @@ def create_price_positioning_chart(
     ax.legend(handles=legend_elements, loc='upper left')
 
     ax.grid(True, alpha=0.3)
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Convert to base64
     buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode()
-    plt.close()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    img_str = base64.b64encode(buffer.getbuffer()).decode()
 
     return img_str
 
@@ -817,7 +822,10 @@ def create_category_comparison_chart(
     if data.empty:
         return None
 
-    fig, ax = plt.subplots(figsize=figsize)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
 
     categories = data['wide_group'].tolist()
     x = np.arange(len(categories))
@@ -851,13 +859,11 @@ def create_category_comparison_chart(
     ax.legend()
     ax.grid(True, alpha=0.3, axis='y')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode()
-    plt.close()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    img_str = base64.b64encode(buffer.getbuffer()).decode()
 
     return img_str
 
@@ -884,7 +890,10 @@ def create_price_gap_waterfall(
     if data.empty:
         return None
 
-    fig, ax = plt.subplots(figsize=figsize)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
 
     items = data['narrow_group'].tolist()
     gaps = data['relative_price_gap'].tolist()
@@ -911,13 +920,11 @@ def create_price_gap_waterfall(
     ax.set_title('Price Gap Analysis by Item', fontsize=13, fontweight='bold')
     ax.grid(True, alpha=0.3, axis='x')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode()
-    plt.close()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    img_str = base64.b64encode(buffer.getbuffer()).decode()
 
     return img_str
 
@@ -943,7 +950,10 @@ def create_percentile_distribution(
     if percentiles.empty:
         return None
 
-    fig, ax = plt.subplots(figsize=figsize)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
 
     # Create histogram
     bins = [0, 25, 50, 75, 100]
@@ -971,13 +981,11 @@ def create_percentile_distribution(
                 fontweight='bold',
             )
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode()
-    plt.close()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    img_str = base64.b64encode(buffer.getbuffer()).decode()
 
     return img_str
 
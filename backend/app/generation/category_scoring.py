@@ -1,6 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.llm.client import LLMClient
-from app.llm.prompts import build_category_scoring_prompt
+from app.llm.prompts import PromptContext, build_category_scoring_prompt
 from app.llm.json_guard import validate_and_parse_json
 from app.questionnaire.loader import load_categories
 
@@ -8,7 +8,8 @@ from app.questionnaire.loader import load_categories
 def score_categories(
     questionnaire_responses: Dict[str, Any],
     derived_signals: Dict[str, Any],
-    vertical_id: str = "restaurant_v0_1"
+    vertical_id: str = "restaurant_v0_1",
+    prompt_context: Optional[PromptContext] = None,
 ) -> List[Dict[str, Any]]:
     """Score the 10 categories using LLM."""
     categories_data = load_categories("v0_1")
@@ -19,6 +20,7 @@ def score_categories(
         derived_signals,
         categories,
         vertical_id=vertical_id,
+        context=prompt_context,
     )
     
     import logging
@@ -1,6 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.llm.client import LLMClient
-from app.llm.prompts import build_core_initiative_expansion_prompt, build_sandbox_prompt
+from app.llm.prompts import PromptContext, build_core_initiative_expansion_prompt, build_sandbox_prompt
 from app.llm.json_guard import validate_and_parse_json
 from app.questionnaire.loader import load_categories
 
@@ -9,7 +9,8 @@ def expand_core_initiatives(
     questionnaire_responses: Dict[str, Any],
     derived_signals: Dict[str, Any],
     selected_category_ids: List[str],
-    vertical_id: str = "restaurant_v0_1"
+    vertical_id: str = "restaurant_v0_1",
+    prompt_context: Optional[PromptContext] = None,
 ) -> List[Dict[str, Any]]:
     """Expand top 4 categories into core initiatives."""
     categories_data = load_categories("v0_1")
@@ -24,6 +25,7 @@ def expand_core_initiatives(
         selected_category_ids,
         categories,
         vertical_id=vertical_id,
+        context=prompt_context,
     )
     
     logger.info("📝 Step 3: Calling LLM for core initiative expansion...")
@@ -57,6 +59,7 @@ def generate_sandbox_initiatives(
     derived_signals: Dict[str, Any],
     selected_category_ids: List[str],
     vertical_id: str = "restaurant_v0_1",
+    prompt_context: Optional[PromptContext] = None,
 ) -> List[Dict[str, Any]]:
     """Generate exactly 3 sandbox experiments."""
     import logging
@@ -67,6 +70,7 @@ def generate_sandbox_initiatives(
         derived_signals,
         selected_category_ids,
         vertical_id=vertical_id,
+        context=prompt_context,
     )
     
     logger.info("🧪 Step 4: Calling LLM for sandbox initiative generation...")
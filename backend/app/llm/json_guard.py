@@ -1,29 +1,82 @@
-import json
 import jsonschema
 import logging
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Union
 from pathlib import Path
 
+from jsonschema import Draft7Validator
+
+from app.util import json_codec
+
+try:
+    import fastjsonschema
+except ImportError:  # fall back to the interpretive jsonschema validator
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
+# Real replies are a few KB; anything past this is a runaway generation and is rejected unparsed
+_MAX_LLM_RESPONSE_CHARS = 1_000_000
+
+if fastjsonschema is not None:
+    _VALIDATION_ERRORS = (jsonschema.ValidationError, fastjsonschema.JsonSchemaException)
+else:
+    _VALIDATION_ERRORS = (jsonschema.ValidationError,)
+
 
+_SCHEMAS_DIR = Path(__file__).resolve().parent.parent / "schemas"
+_SCHEMA_PATHS = {p.name[: -len(".schema.json")]: p for p in _SCHEMAS_DIR.glob("*.schema.json")}
+
+
+@lru_cache(maxsize=None)
 def load_schema(schema_name: str) -> Dict[str, Any]:
-    """Load JSON schema from schemas directory."""
-    schemas_dir = Path(__file__).parent.parent / "schemas"
-    schema_path = schemas_dir / f"{schema_name}.schema.json"
-    
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema not found: {schema_path}")
-    
-    with open(schema_path, "r") as f:
-        return json.load(f)
+    """Load JSON schema from schemas directory (cached; treat the result as read-only)."""
+    schema_path = _SCHEMA_PATHS.get(schema_name) or (_SCHEMAS_DIR / f"{schema_name}.schema.json")
+    try:
+        return json_codec.loads(schema_path.read_bytes())
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Schema not found: {schema_path}") from None
+
+
+@lru_cache(maxsize=None)
+def _get_validator(schema_name: str) -> Callable[[Any], Any]:
+    """
+    Compile the validator for a schema once per process.
+    Returns a callable that raises one of _VALIDATION_ERRORS on invalid data.
+    """
+    schema = load_schema(schema_name)
+    if fastjsonschema is not None:
+        return fastjsonschema.compile(schema)
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema).validate
+
+
+# Warm the LLM response validators at import so the first request doesn't pay for load + compile
+_LLM_RESPONSE_SCHEMAS = ("category_scores", "core_initiatives", "sandbox_initiatives")
+for _name in _LLM_RESPONSE_SCHEMAS:
+    try:
+        _get_validator(_name)
+    except FileNotFoundError:
+        logger.warning("Schema %s not found; its validator will not be preloaded", _name)
+
+
+def is_valid_for_schema(data: Any, schema_name: str) -> bool:
+    """Check already-parsed data against a schema without raising."""
+    try:
+        _get_validator(schema_name)(data)
+    except _VALIDATION_ERRORS:
+        return False
+    return True
 
 
-def _unwrap_single_key_array(data: Any) -> Any:
+def _unwrap_single_key_array(data: Any, expect_array: bool) -> Any:
     """
     GPT-4 with json_object often wraps arrays in an object (e.g. {"initiatives": [...]}).
     If we get a single-key dict whose value is a list, unwrap and return that list.
+    Only applies when the schema expects an array; object schemas get data back untouched.
     """
+    if not expect_array:
+        return data
     if isinstance(data, dict) and len(data) == 1:
         (val,) = data.values()
         if isinstance(val, list):
@@ -31,105 +84,133 @@ def _unwrap_single_key_array(data: Any) -> Any:
     return data
 
 
+def _validation_failed(json_string: Union[str, bytes], schema_name: str, reason: str, retry_on_failure: bool) -> Any:
+    """Log a validation failure, then return placeholder data or raise ValueError."""
+    preview = (json_string or "")[:500]
+    if isinstance(preview, bytes):
+        preview = preview.decode("utf-8", "replace")
+    if len(json_string or "") > 500:
+        preview += "... [truncated]"
+    logger.warning(
+        "⚠️  JSON validation failed for %s: %s. Using placeholder data.",
+        schema_name,
+        reason,
+    )
+    logger.warning("   Raw response preview: %s", preview)
+    if retry_on_failure:
+        return get_mock_data(schema_name)
+    raise ValueError(f"JSON validation failed: {reason}")
+
+
 def validate_and_parse_json(
-    json_string: str,
+    json_string: Union[str, bytes],
     schema_name: str,
     retry_on_failure: bool = True
 ) -> Any:
     """
-    Validate JSON string against schema and return parsed object.
+    Validate JSON string (or UTF-8 bytes) against schema and return parsed object.
     Retries once on failure, then falls back to mock if still failing.
     Unwraps single-key objects (e.g. {"initiatives": [...]}) so GPT-4 json_object output matches array schemas.
     """
+    # Bound worst-case parse memory if the model runs away
+    if json_string and len(json_string) > _MAX_LLM_RESPONSE_CHARS:
+        return _validation_failed(
+            json_string,
+            schema_name,
+            f"Response too large ({len(json_string)} chars > {_MAX_LLM_RESPONSE_CHARS})",
+            retry_on_failure,
+        )
+    
     try:
-        data = json.loads(json_string)
-        data = _unwrap_single_key_array(data)
-
-        schema = load_schema(schema_name)
-        
-        # Check if schema expects array but we got a single object
-        if schema.get("type") == "array" and isinstance(data, dict) and not isinstance(data, list):
-            expected_count = schema.get("minItems", schema.get("maxItems", "multiple"))
-            logger.error(
-                "❌ GPT returned a SINGLE OBJECT instead of an ARRAY for %s. Expected array with %s items, got 1 object.",
-                schema_name,
-                expected_count,
-            )
-            logger.error("   This usually means GPT-4-turbo with json_object mode only generated one item.")
-            logger.error("   The prompt should explicitly request an array with multiple items.")
-            raise ValueError(
-                f"Expected array with {expected_count} items for {schema_name}, but got single object. "
-                f"GPT likely only generated one item instead of the required {expected_count}."
-            )
-        
-        jsonschema.validate(instance=data, schema=schema)
-
-        return data
-    except (json.JSONDecodeError, jsonschema.ValidationError, ValueError) as e:
-        preview = (json_string or "")[:500]
-        if len(json_string or "") > 500:
-            preview += "... [truncated]"
-        logger.warning(
-            "⚠️  JSON validation failed for %s: %s. Using placeholder data.",
+        data = json_codec.loads(json_string)
+    except json_codec.JSONDecodeError as e:
+        return _validation_failed(json_string, schema_name, str(e), retry_on_failure)
+    schema = load_schema(schema_name)
+    expect_array = schema.get("type") == "array"
+    data = _unwrap_single_key_array(data, expect_array)
+    
+    # Check if schema expects array but we got a single object
+    if expect_array and isinstance(data, dict):
+        expected_count = schema.get("minItems", schema.get("maxItems", "multiple"))
+        logger.error(
+            "❌ GPT returned a SINGLE OBJECT instead of an ARRAY for %s. Expected array with %s items, got 1 object.",
+            schema_name,
+            expected_count,
+        )
+        logger.error("   This usually means GPT-4-turbo with json_object mode only generated one item.")
+        logger.error("   The prompt should explicitly request an array with multiple items.")
+        return _validation_failed(
+            json_string,
             schema_name,
-            str(e),
+            f"Expected array with {expected_count} items for {schema_name}, but got single object. "
+            f"GPT likely only generated one item instead of the required {expected_count}.",
+            retry_on_failure,
         )
-        logger.warning("   Raw response preview: %s", preview)
-        if retry_on_failure:
-            return get_mock_data(schema_name)
-        raise ValueError(f"JSON validation failed: {str(e)}")
+    
+    try:
+        _get_validator(schema_name)(data)
+    except _VALIDATION_ERRORS as e:
+        return _validation_failed(json_string, schema_name, str(e), retry_on_failure)
+
+    return data
+
+
+# Placeholder payloads built once; get_mock_data hands out a fresh list of the shared dicts
+_MOCK_CATEGORY_SCORES = (
+    {"category_id": "labor_scheduling", "score": 80, "confidence": 0.8, "rationale": "Labor issues identified"},
+    {"category_id": "service_speed", "score": 70, "confidence": 0.7, "rationale": "Service speed concerns"},
+    {"category_id": "manager_cadence", "score": 75, "confidence": 0.75, "rationale": "Manager execution issues"},
+    {"category_id": "training_consistency", "score": 65, "confidence": 0.65, "rationale": "Training gaps"},
+    {"category_id": "menu_simplicity", "score": 60, "confidence": 0.6, "rationale": "Menu complexity"},
+    {"category_id": "discounting_discipline", "score": 85, "confidence": 0.85, "rationale": "Discounting issues"},
+    {"category_id": "upsell_attachment", "score": 70, "confidence": 0.7, "rationale": "Upselling opportunities"},
+    {"category_id": "marketing_ownership", "score": 75, "confidence": 0.75, "rationale": "Marketing ownership gaps"},
+    {"category_id": "local_search", "score": 60, "confidence": 0.6, "rationale": "Local search opportunities"},
+    {"category_id": "delivery_ops", "score": 55, "confidence": 0.55, "rationale": "Delivery operations"},
+)
+
+# Placeholder initiatives - clearly marked so user knows LLM failed
+_MOCK_CORE_INITIATIVE = {
+    "category_id": "placeholder",
+    "title": "PLACEHOLDER: Core Initiative (LLM generation failed)",
+    "why_now": "This is a placeholder. The LLM failed to generate real initiatives. Check backend logs for errors.",
+    "steps": [
+        "PLACEHOLDER: Real steps will appear when LLM generation succeeds"
+    ],
+    "how_to_measure": [
+        "PLACEHOLDER: Real measurement methods will appear when LLM generation succeeds"
+    ],
+    "assumptions": [
+        "PLACEHOLDER: Real assumptions will appear when LLM generation succeeds"
+    ],
+    "confidence_label": "LOW"
+}
+_MOCK_CORE_INITIATIVES = (_MOCK_CORE_INITIATIVE,) * 4
+
+_MOCK_SANDBOX_INITIATIVE = {
+    "title": "PLACEHOLDER: Sandbox Experiment (LLM generation failed)",
+    "why_this_came_up": "This is a placeholder. The LLM failed to generate real sandbox experiments. Check backend logs for errors.",
+    "why_speculative": "PLACEHOLDER: Real speculative reasoning will appear when LLM generation succeeds.",
+    "test_plan": [
+        "PLACEHOLDER: Real test plan will appear when LLM generation succeeds"
+    ],
+    "stop_conditions": [
+        "PLACEHOLDER: Real stop conditions will appear when LLM generation succeeds"
+    ],
+    "how_to_measure": [
+        "PLACEHOLDER: Real measurement methods will appear when LLM generation succeeds"
+    ],
+    "confidence_label": "LOW"
+}
+_MOCK_SANDBOX_INITIATIVES = (_MOCK_SANDBOX_INITIATIVE,) * 3
+
+_MOCK_DATA = {
+    "category_scores": _MOCK_CATEGORY_SCORES,
+    "core_initiatives": _MOCK_CORE_INITIATIVES,
+    "sandbox_initiatives": _MOCK_SANDBOX_INITIATIVES,
+}
 
 
 def get_mock_data(schema_name: str) -> Any:
-    """Return mock data matching the schema."""
-    if schema_name == "category_scores":
-        return [
-            {"category_id": "labor_scheduling", "score": 80, "confidence": 0.8, "rationale": "Labor issues identified"},
-            {"category_id": "service_speed", "score": 70, "confidence": 0.7, "rationale": "Service speed concerns"},
-            {"category_id": "manager_cadence", "score": 75, "confidence": 0.75, "rationale": "Manager execution issues"},
-            {"category_id": "training_consistency", "score": 65, "confidence": 0.65, "rationale": "Training gaps"},
-            {"category_id": "menu_simplicity", "score": 60, "confidence": 0.6, "rationale": "Menu complexity"},
-            {"category_id": "discounting_discipline", "score": 85, "confidence": 0.85, "rationale": "Discounting issues"},
-            {"category_id": "upsell_attachment", "score": 70, "confidence": 0.7, "rationale": "Upselling opportunities"},
-            {"category_id": "marketing_ownership", "score": 75, "confidence": 0.75, "rationale": "Marketing ownership gaps"},
-            {"category_id": "local_search", "score": 60, "confidence": 0.6, "rationale": "Local search opportunities"},
-            {"category_id": "delivery_ops", "score": 55, "confidence": 0.55, "rationale": "Delivery operations"}
-        ]
-    elif schema_name == "core_initiatives":
-        # Placeholder initiatives - clearly marked so user knows LLM failed
-        placeholder = {
-            "category_id": "placeholder",
-            "title": "PLACEHOLDER: Core Initiative (LLM generation failed)",
-            "why_now": "This is a placeholder. The LLM failed to generate real initiatives. Check backend logs for errors.",
-            "steps": [
-                "PLACEHOLDER: Real steps will appear when LLM generation succeeds"
-            ],
-            "how_to_measure": [
-                "PLACEHOLDER: Real measurement methods will appear when LLM generation succeeds"
-            ],
-            "assumptions": [
-                "PLACEHOLDER: Real assumptions will appear when LLM generation succeeds"
-            ],
-            "confidence_label": "LOW"
-        }
-        return [placeholder] * 4
-    elif schema_name == "sandbox_initiatives":
-        # Placeholder initiatives - clearly marked so user knows LLM failed
-        placeholder = {
-            "title": "PLACEHOLDER: Sandbox Experiment (LLM generation failed)",
-            "why_this_came_up": "This is a placeholder. The LLM failed to generate real sandbox experiments. Check backend logs for errors.",
-            "why_speculative": "PLACEHOLDER: Real speculative reasoning will appear when LLM generation succeeds.",
-            "test_plan": [
-                "PLACEHOLDER: Real test plan will appear when LLM generation succeeds"
-            ],
-            "stop_conditions": [
-                "PLACEHOLDER: Real stop conditions will appear when LLM generation succeeds"
-            ],
-            "how_to_measure": [
-                "PLACEHOLDER: Real measurement methods will appear when LLM generation succeeds"
-            ],
-            "confidence_label": "LOW"
-        }
-        return [placeholder] * 3
-    else:
-        return []
+    """Return mock data matching the schema (shared dicts; do not mutate them)."""
+    return list(_MOCK_DATA.get(schema_name, ()))
@@ -1,46 +1,72 @@
 from __future__ import annotations
 
-import json
-from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+from app.questionnaire.loader import load_questionnaire
+from app.util import json_codec
 
 
 # -------------------------------------------------------------------
 # Questionnaire loading + ordered rendering (boutique-consultant style)
 # -------------------------------------------------------------------
+# Parsing is cached by the questionnaire loader (revalidated on seed mtime); the derived index is
+# cached per vertical_id and rebuilt whenever the loader hands back a newly parsed questionnaire.
+# Cached results are shared between callers: do not mutate them.
 
-def _load_questionnaire(vertical_id: str) -> Dict[str, Any]:
-    from app.questionnaire.loader import load_questionnaire
-    return load_questionnaire(vertical_id)
+def _ordered_questions(questionnaire: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """Question dicts (those with an id) in questionnaire order."""
+    return tuple(
+        qn
+        for sec in questionnaire.get("sections", [])
+        for qn in sec.get("questions", [])
+        if qn.get("id")
+    )
 
 
-def _question_index(vertical_id: str) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
-    """
-    Returns:
-      - ordered_questions: list of question dicts in questionnaire order
-      - by_id: q_id -> question dict
-    """
-    q = _load_questionnaire(vertical_id)
-    ordered: List[Dict[str, Any]] = []
-    by_id: Dict[str, Dict[str, Any]] = {}
-    for sec in q.get("sections", []):
-        for qn in sec.get("questions", []):
-            if qn.get("id"):
-                ordered.append(qn)
-                by_id[qn["id"]] = qn
-    return ordered, by_id
-
-
-def _multi_select_schema(vertical_id: str) -> Dict[str, List[str]]:
-    """Return q_id -> options for multi_select questions."""
-    ordered, by_id = _question_index(vertical_id)
-    out: Dict[str, List[str]] = {}
+def _questions_by_id(ordered: Tuple[Dict[str, Any], ...]) -> Dict[str, Dict[str, Any]]:
+    """q_id -> question dict."""
+    return {qn["id"]: qn for qn in ordered}
+
+
+def _multi_select_schema(ordered: Tuple[Dict[str, Any], ...]) -> Dict[str, Tuple[str, ...]]:
+    """Return q_id -> options (immutable, in questionnaire order) for multi_select questions."""
+    out: Dict[str, Tuple[str, ...]] = {}
     for qn in ordered:
         if qn.get("type") == "multi_select" and qn.get("options"):
-            out[qn["id"]] = list(qn["options"])
+            out[qn["id"]] = tuple(qn["options"])
     return out
 
 
-def _format_answer(qn: Dict[str, Any], value: Any, multi_opts: Dict[str, List[str]]) -> str:
+class QuestionnaireIndex(NamedTuple):
+    """Everything format_responses_for_prompt needs about a vertical's questionnaire."""
+    ordered: Tuple[Dict[str, Any], ...]
+    by_id: Dict[str, Dict[str, Any]]
+    multi_opts: Dict[str, Tuple[str, ...]]
+
+
+# vertical_id -> (questionnaire dict the index was built from, index)
+_questionnaire_indexes: Dict[str, Tuple[Dict[str, Any], QuestionnaireIndex]] = {}
+
+
+def get_questionnaire_index(vertical_id: str) -> QuestionnaireIndex:
+    """Return the ordered/by-id/multi-select index of the vertical's current questionnaire."""
+    questionnaire = load_questionnaire(vertical_id)
+    cached = _questionnaire_indexes.get(vertical_id)
+    if cached is not None and cached[0] is questionnaire:
+        return cached[1]
+    ordered = _ordered_questions(questionnaire)
+    index = QuestionnaireIndex(ordered, _questions_by_id(ordered), _multi_select_schema(ordered))
+    _questionnaire_indexes[vertical_id] = (questionnaire, index)
+    return index
+
+
+# multi_select questions whose unselected options are also shown to the model
+_SHOW_NOT_SELECTED_IDS = frozenset({"E1_channels_used"})
+
+
+def _format_answer(qn: Dict[str, Any], value: Any, multi_opts: Dict[str, Tuple[str, ...]]) -> str:
     q_id = qn.get("id", "")
     q_type = qn.get("type", "")
     options = multi_opts.get(q_id)
@@ -48,11 +74,12 @@ def _format_answer(qn: Dict[str, Any], value: Any, multi_opts: Dict[str, List[st
     # Multi-select handling
     if q_type == "multi_select" and options is not None:
         selected = value if isinstance(value, list) else ([value] if value is not None else [])
-        selected = [str(s).strip() for s in selected if s is not None and str(s).strip()]
-        not_selected = [o for o in options if o not in selected]
+        selected = [t for t in (str(s).strip() for s in selected if s is not None) if t]
+        selected_set = set(selected)
+        not_selected = [o for o in options if o not in selected_set]
 
         # Marketing channels: show both selected and not selected (as you requested)
-        if q_id == "E1_channels_used":
+        if q_id in _SHOW_NOT_SELECTED_IDS:
             sel_str = ", ".join(selected) if selected else "(none)"
             not_str = ", ".join(not_selected) if not_selected else "(none)"
             return f"selected: {sel_str}; not selected: {not_str}"
@@ -64,7 +91,7 @@ def _format_answer(qn: Dict[str, Any], value: Any, multi_opts: Dict[str, List[st
     # Ranking: expect list[str] in ranked order
     if q_type == "ranking":
         if isinstance(value, list) and value:
-            ranked = [str(v).strip() for v in value if v is not None and str(v).strip()]
+            ranked = [t for t in (str(v).strip() for v in value if v is not None) if t]
             return " > ".join(ranked) if ranked else "(none)"
         return "(none)"
 
@@ -78,9 +105,13 @@ def _format_answer(qn: Dict[str, Any], value: Any, multi_opts: Dict[str, List[st
     return str(value) if value is not None else "(none)"
 
 
+_MISSING = object()
+
+
 def format_responses_for_prompt(
     responses: Dict[str, Any],
     vertical_id: Optional[str] = None,
+    index: Optional[QuestionnaireIndex] = None,
 ) -> str:
     """
     Boutique-consultant formatting:
@@ -89,12 +120,15 @@ def format_responses_for_prompt(
     - Multi-select rules:
         * E1_channels_used shows selected + not selected
         * all other multi_select shows only selected
+    Pass a precomputed index (see get_questionnaire_index) to skip the lookup by vertical_id.
     """
-    if not vertical_id:
+    if index is None and vertical_id:
+        index = get_questionnaire_index(vertical_id)
+    if index is None:
         # fallback: stable-ish formatting if vertical unknown
         lines = []
-        for q_id in sorted(responses.keys()):
-            val = responses[q_id]
+        # keys are unique, so sorting items never compares values
+        for q_id, val in sorted(responses.items()):
             if isinstance(val, list):
                 val_str = ", ".join(str(v) for v in val)
             else:
@@ -102,23 +136,22 @@ def format_responses_for_prompt(
             lines.append(f"{q_id}: {val_str}")
         return "\n".join(lines)
 
-    ordered_questions, by_id = _question_index(vertical_id)
-    multi_opts = _multi_select_schema(vertical_id)
+    ordered_questions, by_id, multi_opts = index
 
     lines: List[str] = []
     # Render in questionnaire order for narrative coherence
     for qn in ordered_questions:
         q_id = qn["id"]
-        if q_id not in responses:
+        value = responses.get(q_id, _MISSING)
+        if value is _MISSING:
             continue
         label = qn.get("label", q_id).strip()
-        ans = _format_answer(qn, responses.get(q_id), multi_opts)
+        ans = _format_answer(qn, value, multi_opts)
         lines.append(f"{q_id} ({label}): {ans}")
 
     # Also include any unexpected response keys (defensive)
-    extras = [k for k in responses.keys() if k not in by_id]
-    for k in sorted(extras):
-        v = responses.get(k)
+    for k in sorted(responses.keys() - by_id.keys()):
+        v = responses[k]
         if isinstance(v, list):
             v_str = ", ".join(str(x) for x in v)
         else:
@@ -154,9 +187,21 @@ def build_consultant_brief(
     flags = derived_signals.get("flags", []) or []
     scores = derived_signals.get("scores", {}) or {}
 
-    constraints = [f for f in flags if f.startswith("constraint_")]
-    pains = [f for f in flags if f.startswith("pain_")]
-    other_signals = [f for f in flags if f.startswith("signal_") or f.startswith("profile_")]
+    # Classify flags in one pass by their "<prefix>_" bucket
+    constraints: List[str] = []
+    pains: List[str] = []
+    other_signals: List[str] = []
+    buckets = {
+        "constraint": constraints,
+        "pain": pains,
+        "signal": other_signals,
+        "profile": other_signals,
+    }
+    for f in flags:
+        prefix, sep, _ = f.partition("_")
+        bucket = buckets.get(prefix) if sep else None
+        if bucket is not None:
+            bucket.append(f)
 
     brief = {
         "business_profile": {
@@ -201,27 +246,72 @@ MEASUREMENT RULES:
 - Do NOT use currency, percentages, ROI, margins, or "week-over-week rate" language.
 """
 
+# Voice guide + measurement rules as one precomputed block, interpolated once per prompt
+_STATIC_VOICE_BLOCK = CONSULTANT_VOICE_GUIDE + "\n" + MANUAL_MEASUREMENT_RULES
+
+
+# -------------------------------------------------------------------
+# Shared per-request prompt context
+# -------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class PromptContext:
+    """
+    Prompt pieces that depend only on the intake, shared by all three builders.
+    Build once per generation run with build_prompt_context() and pass it to each builder.
+    """
+    responses_block: str
+    brief: Dict[str, Any]
+    brief_json: str
+    flags_text: str
+    scores_text: str
+    constraints_text: str
+
+
+def build_prompt_context(
+    questionnaire_responses: Dict[str, Any],
+    derived_signals: Dict[str, Any],
+    vertical_id: str = "restaurant_v0_1",
+) -> PromptContext:
+    """Render the intake-derived prompt blocks once."""
+    brief = build_consultant_brief(questionnaire_responses, derived_signals)
+    constraints = brief["constraints"]
+    return PromptContext(
+        responses_block=format_responses_for_prompt(questionnaire_responses, vertical_id),
+        brief=brief,
+        brief_json=json_codec.dumps(brief, pretty=True),
+        flags_text=", ".join(derived_signals.get("flags", [])),
+        scores_text=", ".join(f"{k}: {v:.2f}" for k, v in derived_signals.get("scores", {}).items()),
+        constraints_text=", ".join(constraints) if constraints else "None",
+    )
+
 
 # -------------------------------------------------------------------
 # Prompt builders (category scoring, core initiatives, sandbox)
 # -------------------------------------------------------------------
 
+def _category_key(categories: List[Dict[str, str]]) -> Tuple[Tuple[str, str, str], ...]:
+    """Hashable (id, label, description) view of a category list, used as a render cache key."""
+    return tuple((c["id"], c["label"], c["description"]) for c in categories)
+
+
+@lru_cache(maxsize=64)
+def _render_categories(categories: Tuple[Tuple[str, str, str], ...]) -> str:
+    """Render the '- id: label — description' category block."""
+    return "\n".join(f"- {cid}: {label} — {desc}" for cid, label, desc in categories)
+
+
 def build_category_scoring_prompt(
     questionnaire_responses: Dict[str, Any],
     derived_signals: Dict[str, Any],
     categories: List[Dict[str, str]],
     vertical_id: str = "restaurant_v0_1",
+    context: Optional[PromptContext] = None,
 ) -> str:
     """Build prompt for scoring the 10 categories."""
-    categories_text = "\n".join([
-        f"- {cat['id']}: {cat['label']} — {cat['description']}"
-        for cat in categories
-    ])
-
-    flags_text = ", ".join(derived_signals.get("flags", []))
-    scores_text = ", ".join([f"{k}: {v:.2f}" for k, v in derived_signals.get("scores", {}).items()])
-
-    brief = build_consultant_brief(questionnaire_responses, derived_signals)
+    if context is None:
+        context = build_prompt_context(questionnaire_responses, derived_signals, vertical_id)
+    categories_text = _render_categories(_category_key(categories))
 
     return f"""You are scoring 10 fixed restaurant improvement categories based on intake.
 
@@ -229,14 +319,14 @@ CATEGORIES (you may ONLY score from this list):
 {categories_text}
 
 CONSULTANT BRIEF (structured from intake; treat as context, not analytics):
-{json.dumps(brief, indent=2)}
+{context.brief_json}
 
 QUESTIONNAIRE RESPONSES (ordered; includes question labels):
-{format_responses_for_prompt(questionnaire_responses, vertical_id)}
+{context.responses_block}
 
 DERIVED SIGNALS:
-Flags: {flags_text}
-Scores: {scores_text}
+Flags: {context.flags_text}
+Scores: {context.scores_text}
 
 SCORING RUBRIC (use this rubric explicitly in your thinking):
 - Relevance to stated pains (B1/B2 and pain_* flags)
@@ -268,38 +358,34 @@ def build_core_initiative_expansion_prompt(
     selected_category_ids: List[str],
     categories: List[Dict[str, str]],
     vertical_id: str = "restaurant_v0_1",
+    context: Optional[PromptContext] = None,
 ) -> str:
     """Build prompt for expanding top categories into core initiatives."""
-    selected_categories = [c for c in categories if c["id"] in selected_category_ids]
-    categories_text = "\n".join([
-        f"- {cat['id']}: {cat['label']} — {cat['description']}"
-        for cat in selected_categories
-    ])
-
-    flags = derived_signals.get("flags", [])
-    flags_text = ", ".join(flags)
-    constraints = [f for f in flags if f.startswith("constraint_")]
-    constraints_text = ", ".join(constraints) if constraints else "None"
-
-    brief = build_consultant_brief(questionnaire_responses, derived_signals)
+    if context is None:
+        context = build_prompt_context(questionnaire_responses, derived_signals, vertical_id)
+    # Follow selection order (top-ranked first); ids missing from the catalog are skipped
+    categories_by_id = {c["id"]: c for c in categories}
+    selected_categories = [
+        categories_by_id[cid] for cid in selected_category_ids if cid in categories_by_id
+    ]
+    categories_text = _render_categories(_category_key(selected_categories))
 
     return f"""You are an elite boutique restaurant ops consultant. Expand selected categories into operator-friendly initiatives.
 
 SELECTED CATEGORIES (create exactly 1 initiative per category):
 {categories_text}
 
-{CONSULTANT_VOICE_GUIDE}
-{MANUAL_MEASUREMENT_RULES}
+{_STATIC_VOICE_BLOCK}
 
 CONSULTANT BRIEF:
-{json.dumps(brief, indent=2)}
+{context.brief_json}
 
 QUESTIONNAIRE RESPONSES (ordered; includes question labels):
-{format_responses_for_prompt(questionnaire_responses, vertical_id)}
+{context.responses_block}
 
 DERIVED SIGNALS:
-Flags: {flags_text}
-Constraints: {constraints_text}
+Flags: {context.flags_text}
+Constraints: {context.constraints_text}
 
 TASK:
 Create exactly {len(selected_categories)} core initiatives, one per selected category.
@@ -328,28 +414,28 @@ def build_sandbox_prompt(
     derived_signals: Dict[str, Any],
     selected_category_ids: List[str],
     vertical_id: str = "restaurant_v0_1",
+    context: Optional[PromptContext] = None,
 ) -> str:
     """Build prompt for generating exactly 3 sandbox experiments."""
-    flags_text = ", ".join(derived_signals.get("flags", []))
-    brief = build_consultant_brief(questionnaire_responses, derived_signals)
+    if context is None:
+        context = build_prompt_context(questionnaire_responses, derived_signals, vertical_id)
 
     return f"""You are an elite boutique restaurant ops consultant. Generate sandbox experiments.
 
-{CONSULTANT_VOICE_GUIDE}
-{MANUAL_MEASUREMENT_RULES}
+{_STATIC_VOICE_BLOCK}
 
 DEFINITION:
 Sandbox initiatives are speculative, reversible tests that explore a hypothesis NOT already covered by core initiatives.
 They must be low-lift and realistically runnable within ~30 days.
 
 CONSULTANT BRIEF:
-{json.dumps(brief, indent=2)}
+{context.brief_json}
 
 QUESTIONNAIRE RESPONSES (ordered; includes question labels):
-{format_responses_for_prompt(questionnaire_responses, vertical_id)}
+{context.responses_block}
 
 DERIVED SIGNALS:
-Flags: {flags_text}
+Flags: {context.flags_text}
 
 SELECTED CORE CATEGORIES (avoid redundancy):
 {', '.join(selected_category_ids)}
@@ -1,40 +1,94 @@
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.api.routes import orgs, cycles, questionnaire, generate, results, competitors, menu
+from app.api.routes import orgs, cycles, questionnaire, generate, results, competitors, menu, debug
 from app.db.bootstrap import init_db
 from app.db.session import engine
+from app.util import json_codec
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (unavailable on Windows); stock asyncio still works
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
+# Runners that create their loop after importing the app pick up uvloop from this policy.
+# uvicorn creates its loop first, so it is also started with --loop uvloop (see Dockerfile).
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+_UNLOGGED_PREFIX = "/api/debug/"
+
+
+class LoggingMiddleware:
+    """
+    Request logging as plain ASGI middleware.
+    Avoids BaseHTTPMiddleware's per-request task hop and Request/Response wrapping.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        # Health probes and debug endpoints are not worth a log line each
+        if path == "/" or path.startswith(_UNLOGGED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        logger.info("Incoming request: %s %s", method, path)
+        status_code = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info("Incoming request: %s %s", request.method, request.url.path)
         try:
-            response = await call_next(request)
-            logger.info("Response: %s %s -> %d", request.method, request.url.path, response.status_code)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            logger.exception("Request failed: %s %s -> %s", request.method, request.url.path, e)
+            logger.exception("Request failed: %s %s -> %s", method, path, e)
             raise
+        logger.info("Response: %s %s -> %d", method, path, status_code)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Already running on the uvloop loop when available (policy is set at import, before init_db)
     init_db(engine)
     yield
 
 
-app = FastAPI(title="Consulting Engine API", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="Consulting Engine API",
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson is optional (see app.util.json_codec); fall back to stdlib-backed responses without it
+    default_response_class=ORJSONResponse if json_codec.orjson is not None else JSONResponse,
+)
 
 # Add request logging middleware (before CORS so we see all requests)
 app.add_middleware(LoggingMiddleware)
 
+# Compress larger JSON payloads (results, questionnaire); level 5 keeps CPU cost modest on the hot path
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -45,8 +99,9 @@ app.add_middleware(
         "http://0.0.0.0:5173",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette answer preflights from precomputed headers instead of echoing the request
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
 )
 
 app.include_router(orgs.router, prefix="/api", tags=["organizations"])
@@ -57,69 +112,11 @@ app.include_router(results.router, prefix="/api", tags=["results"])
 app.include_router(competitors.router, prefix="/api", tags=["competitors"])
 app.include_router(menu.router, prefix="/api", tags=["menu"])
 
+# Debug endpoints expose LLM configuration; only mounted when explicitly enabled (docker-compose does for dev)
+if os.getenv("ENABLE_DEBUG_ROUTES") == "1":
+    app.include_router(debug.router, prefix="/api/debug", tags=["debug"])
+
 
 @app.get("/")
 def root():
     return {"status": "ok", "version": "0.1.0"}
-
-
-@app.get("/api/debug/llm")
-def debug_llm():
-    """Debug endpoint to check LLM configuration."""
-    import os
-    from app.llm.client import LLMClient
-    
-    client = LLMClient()
-    return {
-        "provider": client.provider,
-        "api_key_present": bool(client.api_key and client.api_key.strip()),
-        "api_key_prefix": client.api_key[:10] + "..." if client.api_key and len(client.api_key) > 10 else "none",
-        "env_llm_provider": os.getenv("LLM_PROVIDER", "not set"),
-        "env_llm_api_key": "set" if os.getenv("LLM_API_KEY") else "not set",
-        "env_openai_api_key": "set" if os.getenv("OPENAI_API_KEY") else "not set",
-        "env_llm_model": os.getenv("LLM_MODEL", "not set"),
-    }
-
-
-@app.get("/api/debug/test-openai")
-def test_openai():
-    """Test OpenAI connection with a simple request."""
-    import os
-    from app.llm.client import LLMClient
-    
-    client = LLMClient()
-    if client.provider != "openai":
-        return {
-            "status": "skipped",
-            "reason": f"Provider is '{client.provider}', not 'openai'",
-            "provider": client.provider
-        }
-    
-    if not client.api_key or not client.api_key.strip():
-        return {
-            "status": "error",
-            "reason": "API key is missing or empty",
-            "api_key_present": False
-        }
-    
-    try:
-        # Test with a very simple prompt
-        result = client.generate(
-            prompt="Say 'Hello, OpenAI connection test successful!' in exactly those words.",
-            json_mode=False
-        )
-        return {
-            "status": "success",
-            "response_preview": result[:200] if result else "empty",
-            "response_length": len(result) if result else 0,
-            "api_key_present": True,
-            "provider": client.provider
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_type": type(e).__name__,
-            "error_message": str(e)[:500],
-            "api_key_present": True,
-            "provider": client.provider
-        }
@@ -1,7 +1,65 @@
-from typing import Dict, List, Any
+import re
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from app.questionnaire.loader import load_signal_map
 
 
+@lru_cache(maxsize=256)
+def _compiled(pattern: str) -> "re.Pattern[str]":
+    """Compile a signal-map regex once per distinct pattern."""
+    return re.compile(pattern)
+
+
+def _requires_answer(condition: Dict) -> bool:
+    """True if the condition can only pass when its question has been answered."""
+    op = condition.get("op")
+    value = condition.get("value")
+    if op == "equals":
+        return value is not None
+    if op == "in":
+        return not (isinstance(value, list) and None in value)
+    if op == "regex":
+        return not (isinstance(value, str) and _compiled(value).search(""))
+    return True
+
+
+class _RuleIndex:
+    """q_id -> indexes of rules that can only fire when that question is answered."""
+
+    def __init__(self, rules: List[Dict]):
+        by_qid: Dict[str, List[int]] = {}
+        unconditional: List[int] = []
+        for idx, rule in enumerate(rules):
+            qids = {c.get("q") for c in rule.get("when", []) if _requires_answer(c)}
+            if not qids:
+                unconditional.append(idx)
+            for q_id in qids:
+                by_qid.setdefault(q_id, []).append(idx)
+        self.by_qid = by_qid
+        self.unconditional = tuple(unconditional)
+
+    def candidates(self, responses: Dict[str, Any]) -> List[int]:
+        """Rule indexes worth evaluating for these responses, in signal-map order."""
+        found = set(self.unconditional)
+        by_qid = self.by_qid
+        for q_id in responses:
+            found.update(by_qid.get(q_id, ()))
+        return sorted(found)
+
+
+# vertical_id -> (signal map the index was built from, index); rebuilt when the loader returns a new map
+_rule_indexes: Dict[str, Tuple[dict, _RuleIndex]] = {}
+
+
+def _get_rule_index(vertical_id: str, signal_map: dict) -> _RuleIndex:
+    cached = _rule_indexes.get(vertical_id)
+    if cached is not None and cached[0] is signal_map:
+        return cached[1]
+    index = _RuleIndex(signal_map.get("rules", []))
+    _rule_indexes[vertical_id] = (signal_map, index)
+    return index
+
+
 def evaluate_responses(responses: Dict[str, Any], vertical_id: str = "restaurant_v0_1") -> Dict[str, Any]:
     """
     Evaluate questionnaire responses against signal map rules.
@@ -12,7 +70,10 @@ def evaluate_responses(responses: Dict[str, Any], vertical_id: str = "restaurant
     scores: Dict[str, float] = {}
     notes: List[str] = []
     
-    for rule in signal_map.get("rules", []):
+    rules = signal_map.get("rules", [])
+    # Only rules touching an answered question (or with no answer requirement) can fire
+    for rule_idx in _get_rule_index(vertical_id, signal_map).candidates(responses or {}):
+        rule = rules[rule_idx]
         when_conditions = rule.get("when", [])
         then_action = rule.get("then", {})
         
@@ -35,7 +96,7 @@ def evaluate_responses(responses: Dict[str, Any], vertical_id: str = "restaurant
                         scores[key] = (value - 1) / 4.0  # Maps 1->0, 5->1
     
     return {
-        "flags": list(set(flags)),  # Deduplicate
+        "flags": list(dict.fromkeys(flags)),  # Deduplicate, keeping rule order
         "scores": scores,
         "notes": ["Derived from questionnaire only."] if not notes else notes
     }
@@ -85,22 +146,16 @@ def evaluate_condition(condition: Dict, responses: Dict[str, Any]) -> bool:
         return False
     
     if op == "lte":
-        try:
-            return float(response_value) <= float(value)
-        except (ValueError, TypeError):
-            return False
+        lhs, rhs = _as_numbers(response_value, value)
+        return lhs is not None and lhs <= rhs
     
     if op == "gte":
-        try:
-            return float(response_value) >= float(value)
-        except (ValueError, TypeError):
-            return False
+        lhs, rhs = _as_numbers(response_value, value)
+        return lhs is not None and lhs >= rhs
     
     if op == "regex":
-        import re
-        pattern = value
         text = str(response_value) if response_value is not None else ""
-        return bool(re.search(pattern, text))
+        return bool(_compiled(value).search(text))
     
     if op == "array_first":
         # Check if response is an array and first element equals value
@@ -111,6 +166,21 @@ def evaluate_condition(condition: Dict, responses: Dict[str, Any]) -> bool:
     return False
 
 
+def _as_numbers(response_value: Any, value: Any) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Coerce both sides of a numeric comparison; (None, None) if either is not numeric.
+    Unanswered and already-numeric values skip the float()/exception path.
+    """
+    if response_value is None:
+        return None, None
+    if isinstance(response_value, (int, float)) and isinstance(value, (int, float)):
+        return response_value, value
+    try:
+        return float(response_value), float(value)
+    except (ValueError, TypeError):
+        return None, None
+
+
 def get_response_value(responses: Dict[str, Any], question_id: str) -> Any:
     """Get response value for a question ID."""
     if not responses:
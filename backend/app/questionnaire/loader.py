@@ -1,6 +1,28 @@
-import json
 import os
+import threading
 from pathlib import Path
+from typing import Dict, Tuple
+
+from app.util import json_codec
+
+# Parsed seed files keyed by path, revalidated by mtime so edited seeds are picked up without a restart.
+# Cached dicts are shared between callers: do not mutate them.
+_json_cache: Dict[Path, Tuple[float, dict]] = {}
+_json_cache_lock = threading.Lock()
+
+
+def _read_json(filepath: Path) -> dict:
+    """Parse a seed JSON file, reusing the cached copy while its mtime is unchanged."""
+    mtime = filepath.stat().st_mtime
+    with _json_cache_lock:
+        cached = _json_cache.get(filepath)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(filepath, "rb") as f:
+        data = json_codec.loads(f.read())
+    with _json_cache_lock:
+        _json_cache[filepath] = (mtime, data)
+    return data
 
 
 def load_questionnaire(vertical_id: str = "restaurant_v0_1") -> dict:
@@ -12,8 +34,7 @@ def load_questionnaire(vertical_id: str = "restaurant_v0_1") -> dict:
     if not filepath.exists():
         raise FileNotFoundError(f"Questionnaire not found: {filepath}")
     
-    with open(filepath, "r") as f:
-        return json.load(f)
+    return _read_json(filepath)
 
 
 def load_signal_map(vertical_id: str = "restaurant_v0_1") -> dict:
@@ -31,8 +52,7 @@ def load_signal_map(vertical_id: str = "restaurant_v0_1") -> dict:
     if not filepath.exists():
         raise FileNotFoundError(f"Signal map not found: {filepath}")
     
-    with open(filepath, "r") as f:
-        return json.load(f)
+    return _read_json(filepath)
 
 
 def load_categories(version: str = "v0_1") -> dict:
@@ -44,5 +64,4 @@ def load_categories(version: str = "v0_1") -> dict:
     if not filepath.exists():
         raise FileNotFoundError(f"Categories not found: {filepath}")
     
-    with open(filepath, "r") as f:
-        return json.load(f)
+    return _read_json(filepath)
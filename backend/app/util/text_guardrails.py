@@ -1,6 +1,24 @@
 import re
 from typing import Tuple
 
+# Any character that could trigger a violation; text without one is valid as-is
+_TRIGGER_RE = re.compile(r'[\d$€£%]')
+_CURRENCY_RE = re.compile(r'[$€£]')
+# Deletes currency symbols and percent signs in one str.translate pass
+_STRIP_TABLE = str.maketrans('', '', '$€£%')
+_NUMBER_RE = re.compile(r'\b\d{2,}\b')
+# Large numbers are allowed when they count days ("30 days", "90 days")
+_DAYS_AFTER_RE = re.compile(r'\s+days?\b', re.IGNORECASE)
+
+
+def _is_day_count(m: re.Match) -> bool:
+    """True if the matched number is directly followed by "day"/"days"."""
+    return _DAYS_AFTER_RE.match(m.string, m.end()) is not None
+
+
+def _mask_number(m: re.Match) -> str:
+    return m.group() if _is_day_count(m) else '[value]'
+
 
 def check_guardrails(text: str) -> Tuple[bool, str]:
     """
@@ -10,10 +28,13 @@ def check_guardrails(text: str) -> Tuple[bool, str]:
     if not text or not isinstance(text, str):
         return True, text or ""
     
+    if not _TRIGGER_RE.search(text):
+        return True, text
+    
     violations = []
     
     # Check for currency symbols
-    if re.search(r'[$€£]', text):
+    if _CURRENCY_RE.search(text):
         violations.append("currency")
     
     # Check for percent sign
@@ -21,28 +42,14 @@ def check_guardrails(text: str) -> Tuple[bool, str]:
         violations.append("percent")
     
     # Check for large numbers (2+ digits), but allow "30 days" and "90 days"
-    # Pattern: \b\d{2,}\b but exclude when followed by " days" or "day"
-    number_pattern = r'\b\d{2,}\b'
-    numbers = re.findall(number_pattern, text)
-    for num in numbers:
-        # Check if it's in a whitelisted context
-        num_context = re.search(rf'\b{num}\s+days?\b', text, re.IGNORECASE)
-        if not num_context:
-            violations.append("large_number")
-            break
+    if any(not _is_day_count(m) for m in _NUMBER_RE.finditer(text)):
+        violations.append("large_number")
     
     if violations:
-        # Clean the text
-        cleaned = text
-        # Remove currency symbols
-        cleaned = re.sub(r'[$€£]', '', cleaned)
-        # Remove percent signs
-        cleaned = cleaned.replace('%', '')
-        # Replace large numbers with [value]
-        cleaned = re.sub(r'\b(\d{2,})\b', '[value]', cleaned)
-        # But restore "30 days" and "90 days"
-        cleaned = re.sub(r'\[value\]\s+days?', '30 days', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\[value\]\s+days?', '90 days', cleaned, flags=re.IGNORECASE)
+        # Clean the text: remove currency symbols and percent signs
+        cleaned = text.translate(_STRIP_TABLE)
+        # Replace large numbers with [value], keeping day counts ("30 days", "90 days")
+        cleaned = _NUMBER_RE.sub(_mask_number, cleaned)
         
         return False, cleaned
     